@@ -16,6 +16,9 @@
 # MAGIC ## 사전 요구사항
 # MAGIC
 # MAGIC - Unity Catalog가 활성화된 Databricks 작업 공간
+# MAGIC - 서버리스 또는 Pro SQL 웨어하우스 (노트북 밖에서 스트리밍 테이블과 Materialized View를 생성/갱신하는 데 필요)
+# MAGIC - 카탈로그/스키마에서 Predictive Optimization 사용 가능 (`ALTER SCHEMA ... ENABLE PREDICTIVE OPTIMIZATION` 권한 포함)
+# MAGIC - Metric View YAML 1.1 및 실험적 기능인 Metric View `materialization` 사용 가능
 
 # COMMAND ----------
 
@@ -53,12 +56,55 @@
 # MAGIC CREATE SCHEMA IF NOT EXISTS gold;
 # MAGIC CREATE SCHEMA IF NOT EXISTS metrics;
 # MAGIC
+# MAGIC -- 데이터 스키마의 테이블은 Predictive Optimization으로 작은 파일 압축과 최적화를 자동 수행
+# MAGIC ALTER SCHEMA bronze ENABLE PREDICTIVE OPTIMIZATION;
+# MAGIC ALTER SCHEMA silver ENABLE PREDICTIVE OPTIMIZATION;
+# MAGIC ALTER SCHEMA gold ENABLE PREDICTIVE OPTIMIZATION;
+# MAGIC
 # MAGIC -- 현재 설정된 카탈로그와 데이터베이스 확인
 # MAGIC SELECT current_catalog(), current_database();
 # MAGIC
 
 # COMMAND ----------
 
+# 이전 버전의 데모를 실행한 환경에는 일부 객체가 다른 유형(테이블/MV/뷰)으로 남아 있어 아래 CREATE 문이 실패하므로,
+# 유형이 바뀐 객체만 미리 삭제 (유형이 같으면 그대로 두어 스트리밍 테이블의 증분 상태를 유지)
+# DROP TABLE/DROP VIEW는 객체 유형이 다르면 IF EXISTS를 지정해도 실패하므로, 현재 유형을 확인한 뒤 맞는 DROP 문을 사용
+# 이 노트북이 생성하는 모든 객체와 기대 유형
+expected_types = {
+    ("bronze", "raw_transactions"): "MANAGED",
+    ("bronze", "raw_products"): "MANAGED",
+    ("bronze", "raw_stores"): "MANAGED",
+    ("silver", "transactions"): "STREAMING_TABLE",
+    ("silver", "products"): "STREAMING_TABLE",
+    ("silver", "stores"): "STREAMING_TABLE",
+    ("silver", "customer_totals"): "MATERIALIZED_VIEW",
+    ("silver", "customer_segments"): "VIEW",
+    ("gold", "retail_sales_base"): "VIEW",
+    ("gold", "retail_sales_historical"): "MATERIALIZED_VIEW",
+    ("gold", "retail_sales_recent"): "MATERIALIZED_VIEW",
+    ("gold", "retail_sales"): "VIEW",
+    ("gold", "daily_cumulative_revenue"): "MATERIALIZED_VIEW",
+    ("metrics", "retail_metrics"): "METRIC_VIEW",
+    ("metrics", "retail_metrics_time"): "METRIC_VIEW",
+    ("metrics", "retail_metrics_last_90d"): "METRIC_VIEW",
+}
+drop_commands = {"VIEW": "DROP VIEW", "METRIC_VIEW": "DROP VIEW", "MATERIALIZED_VIEW": "DROP MATERIALIZED VIEW"}
+
+existing_objects = spark.sql("""
+  SELECT table_schema, table_name, table_type
+  FROM information_schema.tables
+  WHERE table_schema IN ('bronze', 'silver', 'gold', 'metrics')
+""").collect()
+
+for obj in existing_objects:
+    expected_type = expected_types.get((obj.table_schema, obj.table_name))
+    if expected_type and obj.table_type != expected_type:
+        drop_command = drop_commands.get(obj.table_type, "DROP TABLE")
+        spark.sql(f"{drop_command} IF EXISTS {obj.table_schema}.{obj.table_name}")
+
+# COMMAND ----------
+
 # MAGIC %md
 # MAGIC ## 2. 전통적인 접근 방식: 메달리온 아키텍처
 # MAGIC
@@ -111,97 +157,164 @@
 
 # MAGIC %sql
 # MAGIC -- 샘플 데이터를 사용하여 브론즈 테이블을 채웁니다
-# MAGIC INSERT INTO bronze.raw_transactions VALUES
-# MAGIC   ('t001', 's001', 'p001', 'c001', 2, 19.98, '2025-01-01 08:30:00', '{"payment_method":"credit","promotion_code":"NEWYEAR","device":"mobile"}'),
-# MAGIC   ('t002', 's001', 'p002', 'c002', 1, 29.99, '2025-01-01 09:45:00', '{"payment_method":"debit","device":"web"}'),
-# MAGIC   ('t003', 's002', 'p001', 'c003', 3, 29.97, '2025-01-01 10:15:00', '{"payment_method":"cash","device":"in-store"}'),
-# MAGIC   ('t004', 's002', 'p003', 'c001', 1, 49.99, '2025-01-01 11:20:00', '{"payment_method":"credit","promotion_code":"NEWYEAR","device":"mobile"}'),
-# MAGIC   ('t005', 's001', 'p002', 'c004', 2, 59.98, '2025-01-02 08:10:00', '{"payment_method":"credit","device":"web"}'),
-# MAGIC   ('t006', 's003', 'p003', 'c002', 1, 49.99, '2025-01-02 09:30:00', '{"payment_method":"gift_card","device":"in-store"}'),
-# MAGIC   ('t007', 's001', 'p001', 'c003', 4, 39.96, '2025-01-02 14:20:00', '{"payment_method":"credit","device":"mobile"}'),
-# MAGIC   ('t008', 's002', 'p004', 'c005', 1, 99.99, '2025-01-02 16:45:00', '{"payment_method":"paypal","device":"web"}'),
-# MAGIC   ('t009', 's003', 'p002', 'c001', 2, 59.98, '2025-01-03 10:30:00', '{"payment_method":"credit","promotion_code":"WEEKEND","device":"mobile"}'),
-# MAGIC   ('t010', 's001', 'p004', 'c004', 1, 99.99, '2025-01-03 13:15:00', '{"payment_method":"debit","device":"web"}');
-# MAGIC
-# MAGIC INSERT INTO bronze.raw_products VALUES
+# MAGIC -- 이미 적재된 키는 건너뛰므로, 노트북을 다시 실행해도 중복 행이 추가되지 않음
+# MAGIC MERGE INTO bronze.raw_transactions t
+# MAGIC USING (VALUES
+# MAGIC   ('t001', 's001', 'p001', 'c001', 2, 19.98, TIMESTAMP'2025-01-01 08:30:00', '{"payment_method":"credit","promotion_code":"NEWYEAR","device":"mobile"}'),
+# MAGIC   ('t002', 's001', 'p002', 'c002', 1, 29.99, TIMESTAMP'2025-01-01 09:45:00', '{"payment_method":"debit","device":"web"}'),
+# MAGIC   ('t003', 's002', 'p001', 'c003', 3, 29.97, TIMESTAMP'2025-01-01 10:15:00', '{"payment_method":"cash","device":"in-store"}'),
+# MAGIC   ('t004', 's002', 'p003', 'c001', 1, 49.99, TIMESTAMP'2025-01-01 11:20:00', '{"payment_method":"credit","promotion_code":"NEWYEAR","device":"mobile"}'),
+# MAGIC   ('t005', 's001', 'p002', 'c004', 2, 59.98, TIMESTAMP'2025-01-02 08:10:00', '{"payment_method":"credit","device":"web"}'),
+# MAGIC   ('t006', 's003', 'p003', 'c002', 1, 49.99, TIMESTAMP'2025-01-02 09:30:00', '{"payment_method":"gift_card","device":"in-store"}'),
+# MAGIC   ('t007', 's001', 'p001', 'c003', 4, 39.96, TIMESTAMP'2025-01-02 14:20:00', '{"payment_method":"credit","device":"mobile"}'),
+# MAGIC   ('t008', 's002', 'p004', 'c005', 1, 99.99, TIMESTAMP'2025-01-02 16:45:00', '{"payment_method":"paypal","device":"web"}'),
+# MAGIC   ('t009', 's003', 'p002', 'c001', 2, 59.98, TIMESTAMP'2025-01-03 10:30:00', '{"payment_method":"credit","promotion_code":"WEEKEND","device":"mobile"}'),
+# MAGIC   ('t010', 's001', 'p004', 'c004', 1, 99.99, TIMESTAMP'2025-01-03 13:15:00', '{"payment_method":"debit","device":"web"}')
+# MAGIC ) AS s(transaction_id, store_id, product_id, customer_id, quantity, amount, transaction_date, raw_metadata)
+# MAGIC ON t.transaction_id = s.transaction_id
+# MAGIC WHEN NOT MATCHED THEN INSERT *;
+# MAGIC
+# MAGIC MERGE INTO bronze.raw_products t
+# MAGIC USING (VALUES
 # MAGIC   ('p001', 'T-Shirt Basic', 'Apparel', 9.99, '{"color":"multi","size":"S-XL","material":"cotton","supplier_id":"sup123"}'),
 # MAGIC   ('p002', 'Jeans Classic', 'Apparel', 29.99, '{"color":"blue","size":"28-36","material":"denim","supplier_id":"sup456"}'),
 # MAGIC   ('p003', 'Running Shoes', 'Footwear', 49.99, '{"color":"black","size":"6-12","material":"synthetic","supplier_id":"sup789"}'),
-# MAGIC   ('p004', 'Smart Watch', 'Electronics', 99.99, '{"color":"silver","connectivity":"bluetooth","waterproof":true,"supplier_id":"sup101"}');
+# MAGIC   ('p004', 'Smart Watch', 'Electronics', 99.99, '{"color":"silver","connectivity":"bluetooth","waterproof":true,"supplier_id":"sup101"}')
+# MAGIC ) AS s(product_id, product_name, category, price, product_metadata)
+# MAGIC ON t.product_id = s.product_id
+# MAGIC WHEN NOT MATCHED THEN INSERT *;
 # MAGIC
-# MAGIC INSERT INTO bronze.raw_stores VALUES
+# MAGIC MERGE INTO bronze.raw_stores t
+# MAGIC USING (VALUES
 # MAGIC   ('s001', 'Downtown Store', 'East', '{"address":"123 Main St","sqft":2500,"opening_hours":"9AM-9PM","manager_id":"m101"}'),
 # MAGIC   ('s002', 'Mall Location', 'West', '{"address":"456 Market Ave","sqft":1800,"opening_hours":"10AM-8PM","manager_id":"m102"}'),
-# MAGIC   ('s003', 'Airport Shop', 'South', '{"address":"789 Airport Blvd","sqft":800,"opening_hours":"7AM-10PM","manager_id":"m103"}');
+# MAGIC   ('s003', 'Airport Shop', 'South', '{"address":"789 Airport Blvd","sqft":800,"opening_hours":"7AM-10PM","manager_id":"m103"}')
+# MAGIC ) AS s(store_id, store_name, region, store_metadata)
+# MAGIC ON t.store_id = s.store_id
+# MAGIC WHEN NOT MATCHED THEN INSERT *;
 
 # COMMAND ----------
 
 # MAGIC %md
 # MAGIC ### 실버 계층 생성 (정제된 데이터)
+# MAGIC
+# MAGIC 실버 테이블은 스트리밍 테이블로 생성합니다. 스트리밍 테이블은 브론즈 테이블에 새로 추가된 행만 읽어 JSON을 파싱하므로, 실행할 때마다 전체 데이터를 다시 스캔하지 않습니다. 파이프라인 밖에서 생성한 스트리밍 테이블은 이 셀을 다시 실행해야만 갱신되므로, `SCHEDULE EVERY 15 MINUTES`로 주기적으로 새 데이터를 반영하도록 합니다.
+# MAGIC
+# MAGIC 상품/매장처럼 값이 변경될 수 있는 차원 테이블은 Lakeflow 선언적 파이프라인에서 `AUTO CDC`(SCD Type 1)로 관리하는 것이 좋습니다. 이 경우 브론즈 테이블에 변경 순서를 나타내는 컬럼(예: `updated_at`)이 필요합니다:
+# MAGIC
+# MAGIC ```
+# MAGIC CREATE OR REFRESH STREAMING TABLE silver.products;
+# MAGIC
+# MAGIC CREATE FLOW products_cdc AS AUTO CDC INTO silver.products
+# MAGIC FROM STREAM(bronze.raw_products)
+# MAGIC KEYS (product_id)
+# MAGIC SEQUENCE BY updated_at
+# MAGIC STORED AS SCD TYPE 1;
+# MAGIC ```
+# MAGIC
+# MAGIC 파이프라인은 브론즈 → 실버 → 골드 MV → Metric View 순서의 의존성을 자동으로 관리합니다.
+# MAGIC
+# MAGIC 대용량 초기 적재(백필)도 별도의 Python 경로를 두지 않고 이 스트리밍 테이블로 처리합니다. 스트리밍 테이블에는 직접 쓸 수 없어, 외부에서 미리 파싱한 결과를 넣더라도 스트리밍 테이블은 같은 브론즈 이력을 다시 처리하게 됩니다. 과거 데이터를 따로 채워야 한다면 파이프라인에서 일회성 백필 flow(`INSERT INTO ONCE`)를 추가하는 방식을 사용하세요.
 
 # COMMAND ----------
 
 # MAGIC %sql
-# MAGIC -- 실버 계층: JSON 추출을 통해 향상된 거래 데이터
-# MAGIC CREATE TABLE IF NOT EXISTS silver.transactions AS
+# MAGIC -- 실버 계층: JSON 추출을 통해 향상된 거래 데이터 (새로 들어온 브론즈 행만 파싱하는 스트리밍 테이블)
+# MAGIC -- from_json으로 JSON을 행당 한 번만 파싱한 뒤, 구조체 필드를 꺼내 사용
+# MAGIC -- 골드 최근 MV가 거래 일자 경계로 최근 데이터만 읽을 수 있도록 transaction_day로 클러스터링
+# MAGIC CREATE OR REFRESH STREAMING TABLE silver.transactions
+# MAGIC CLUSTER BY (transaction_day)
+# MAGIC SCHEDULE EVERY 15 MINUTES
+# MAGIC AS
 # MAGIC SELECT
 # MAGIC   transaction_id,
 # MAGIC   store_id,
 # MAGIC   product_id,
 # MAGIC   customer_id,
+# MAGIC   -- 골드 조인에 사용할 정수형 대리 키 (STRING 키보다 해시 조인 비용이 작음)
+# MAGIC   xxhash64(store_id) AS store_sk,
+# MAGIC   xxhash64(product_id) AS product_sk,
+# MAGIC   xxhash64(customer_id) AS customer_sk,
 # MAGIC   quantity,
 # MAGIC   amount,
 # MAGIC   transaction_date,
 # MAGIC   DATE(transaction_date) AS transaction_day,
-# MAGIC   get_json_object(raw_metadata, '$.payment_method') AS payment_method,
-# MAGIC   get_json_object(raw_metadata, '$.promotion_code') AS promotion_code,
-# MAGIC   get_json_object(raw_metadata, '$.device') AS purchase_device
-# MAGIC FROM bronze.raw_transactions;
+# MAGIC   md.payment_method,
+# MAGIC   md.promotion_code,
+# MAGIC   md.device AS purchase_device
+# MAGIC FROM (
+# MAGIC   SELECT
+# MAGIC     *,
+# MAGIC     from_json(raw_metadata, 'payment_method STRING, promotion_code STRING, device STRING') AS md
+# MAGIC   FROM STREAM(bronze.raw_transactions)
+# MAGIC );
 # MAGIC
 # MAGIC -- 실버 계층: JSON 추출을 통해 향상된 상품 데이터
-# MAGIC CREATE TABLE IF NOT EXISTS silver.products AS
+# MAGIC CREATE OR REFRESH STREAMING TABLE silver.products
+# MAGIC SCHEDULE EVERY 15 MINUTES
+# MAGIC AS
 # MAGIC SELECT
 # MAGIC   product_id,
+# MAGIC   xxhash64(product_id) AS product_sk,
 # MAGIC   product_name,
 # MAGIC   category,
 # MAGIC   price,
-# MAGIC   get_json_object(product_metadata, '$.color') AS color,
-# MAGIC   get_json_object(product_metadata, '$.size') AS size,
-# MAGIC   get_json_object(product_metadata, '$.material') AS material,
-# MAGIC   get_json_object(product_metadata, '$.supplier_id') AS supplier_id
-# MAGIC FROM bronze.raw_products;
+# MAGIC   md.color,
+# MAGIC   md.size,
+# MAGIC   md.material,
+# MAGIC   md.supplier_id
+# MAGIC FROM (
+# MAGIC   SELECT
+# MAGIC     *,
+# MAGIC     from_json(product_metadata, 'color STRING, size STRING, material STRING, supplier_id STRING') AS md
+# MAGIC   FROM STREAM(bronze.raw_products)
+# MAGIC );
 # MAGIC
 # MAGIC -- 실버 계층: JSON 추출을 통해 향상된 매장 데이터
-# MAGIC CREATE TABLE IF NOT EXISTS silver.stores AS
+# MAGIC CREATE OR REFRESH STREAMING TABLE silver.stores
+# MAGIC SCHEDULE EVERY 15 MINUTES
+# MAGIC AS
 # MAGIC SELECT
 # MAGIC   store_id,
+# MAGIC   xxhash64(store_id) AS store_sk,
 # MAGIC   store_name,
 # MAGIC   region,
-# MAGIC   get_json_object(store_metadata, '$.address') AS address,
-# MAGIC   cast(get_json_object(store_metadata, '$.sqft') AS INT) AS square_feet,
-# MAGIC   get_json_object(store_metadata, '$.opening_hours') AS opening_hours,
-# MAGIC   get_json_object(store_metadata, '$.manager_id') AS manager_id
-# MAGIC FROM bronze.raw_stores;
+# MAGIC   md.address,
+# MAGIC   md.sqft AS square_feet,
+# MAGIC   md.opening_hours,
+# MAGIC   md.manager_id
+# MAGIC FROM (
+# MAGIC   SELECT
+# MAGIC     *,
+# MAGIC     from_json(store_metadata, 'address STRING, sqft INT, opening_hours STRING, manager_id STRING') AS md
+# MAGIC   FROM STREAM(bronze.raw_stores)
+# MAGIC );
 
 # COMMAND ----------
 
 # MAGIC %sql
-# MAGIC -- 구매 행동을 기반으로 한 간단한 고객 세분화 테이블 생성
-# MAGIC CREATE TABLE IF NOT EXISTS silver.customer_segments AS
+# MAGIC -- 고객별 누적 구매 금액 MV: 새로 들어온 거래만 고객별 SUM에 증분 반영
+# MAGIC CREATE OR REPLACE MATERIALIZED VIEW silver.customer_totals
+# MAGIC SCHEDULE EVERY 1 HOUR
+# MAGIC AS
+# MAGIC SELECT
+# MAGIC   customer_id,
+# MAGIC   customer_sk,
+# MAGIC   SUM(amount) AS total_spend
+# MAGIC FROM silver.transactions
+# MAGIC GROUP BY customer_id, customer_sk;
+# MAGIC
+# MAGIC -- 구매 행동을 기반으로 한 간단한 고객 세분화 뷰 생성 (CASE 분류는 가벼우므로 일반 뷰로 유지)
+# MAGIC CREATE OR REPLACE VIEW silver.customer_segments AS
 # MAGIC SELECT
 # MAGIC   customer_id,
+# MAGIC   customer_sk,
 # MAGIC   CASE 
 # MAGIC     WHEN total_spend >= 100 THEN 'High Value'
 # MAGIC     WHEN total_spend >= 50 THEN 'Medium Value'
 # MAGIC     ELSE 'Low Value'
 # MAGIC   END AS value_segment
-# MAGIC FROM (
-# MAGIC   SELECT
-# MAGIC     customer_id,
-# MAGIC     SUM(amount) AS total_spend
-# MAGIC   FROM silver.transactions
-# MAGIC   GROUP BY customer_id
-# MAGIC );
+# MAGIC FROM silver.customer_totals;
 # MAGIC
 # MAGIC -- 향상된 실버 테이블을 확인해보세요
 # MAGIC SELECT * FROM silver.transactions LIMIT 5;
@@ -210,18 +323,27 @@
 
 # MAGIC %md
 # MAGIC ### 골드 계층 생성 (사전 집계된 비즈니스 데이터)
+# MAGIC
+# MAGIC 골드 데이터는 Materialized View(MV)로 저장하되, 갱신 주기가 다른 두 부분으로 나눕니다:
+# MAGIC
+# MAGIC - `gold.retail_sales_historical`: 2일 이전의 과거 데이터. 매일 한 번 갱신하며, 늦게 도착한 정정 데이터나 백필은 이 MV만 다시 계산하면 됩니다.
+# MAGIC - `gold.retail_sales_recent`: 과거 MV에 아직 포함되지 않은 최근 데이터. 범위가 작으므로 15분마다 자주 갱신합니다.
+# MAGIC
+# MAGIC 두 MV의 경계는 현재 시각이 아니라 과거 MV에 실제로 적재된 마지막 일자로 정합니다. 따라서 두 MV의 갱신 시점이 달라도, 과거 MV 갱신이 실패하더라도 빠지는 일자가 생기지 않습니다.
+# MAGIC
+# MAGIC `gold.retail_sales`는 두 MV를 합친 뷰이며, Metric View는 이 뷰를 소스로 사용합니다.
 
 # COMMAND ----------
 
 # MAGIC %sql
-# MAGIC -- 비즈니스 친화적인 필드와 일부 기술적인 필드가 혼합된 골드 테이블 재생성
-# MAGIC -- 기존 테이블 삭제
-# MAGIC drop table if exists gold.retail_sales;
-# MAGIC
-# MAGIC -- 대부분은 이해하기 쉬운 필드명을 사용하되, 일부는 기술적인 이름을 포함한 골드 테이블 생성
-# MAGIC CREATE TABLE IF NOT EXISTS gold.retail_sales AS
-# MAGIC SELECT
-# MAGIC   DATE(t.transaction_date) AS date,
+# MAGIC -- 비즈니스 친화적인 필드와 일부 기술적인 필드가 혼합된 골드 집계 정의
+# MAGIC -- 집계 로직은 이 뷰에 한 번만 정의하고, 데이터는 아래의 과거/최근 MV에 나누어 저장
+# MAGIC
+# MAGIC -- 대부분은 이해하기 쉬운 필드명을 사용하되, 일부는 기술적인 이름을 포함
+# MAGIC CREATE OR REPLACE VIEW gold.retail_sales_base AS
+# MAGIC -- 매장/상품/고객 세그먼트는 작은 차원 테이블이므로 브로드캐스트 조인으로 거래 데이터 셔플을 피함
+# MAGIC SELECT /*+ BROADCAST(s, p, cs) */
+# MAGIC   t.transaction_day AS date,
 # MAGIC   s.store_name,
 # MAGIC   s.region,
 # MAGIC   p.category,
@@ -229,26 +351,97 @@
 # MAGIC   t.payment_method,
 # MAGIC   t.purchase_device AS device_type,
 # MAGIC   -- 기술적인 필드명
-# MAGIC   cs.value_segment AS cust_segment,
+# MAGIC   COALESCE(cs.value_segment, 'Unknown') AS cust_segment,
 # MAGIC   -- 축약된 기술 필드명
+# MAGIC   -- 일자에서 파생되는 차원은 쿼리마다 계산하지 않도록 갱신 시 한 번만 계산하여 저장
+# MAGIC   -- (device_type, cust_segment의 비즈니스 용어 변환은 Metric View에서 정의)
+# MAGIC   date_format(t.transaction_day, 'EEEE') AS day_of_week,
+# MAGIC   CASE
+# MAGIC     WHEN date_format(t.transaction_day, 'E') IN ('Sat', 'Sun') THEN 'Weekend'
+# MAGIC     ELSE 'Weekday'
+# MAGIC   END AS is_weekend,
 # MAGIC   -- 사전 계산된 지표들
-# MAGIC   COUNT(DISTINCT t.transaction_id) AS transaction_count,
+# MAGIC   -- transaction_id는 실버 거래 테이블에서 유일하므로 COUNT(DISTINCT) 대신 증분 갱신이 가능한 COUNT(*) 사용
+# MAGIC   COUNT(*) AS transaction_count,
 # MAGIC   SUM(t.quantity) AS quantity_sold,
 # MAGIC   SUM(t.amount) AS revenue
 # MAGIC FROM
 # MAGIC   silver.transactions t
-# MAGIC   JOIN silver.stores s ON t.store_id = s.store_id
-# MAGIC   JOIN silver.products p ON t.product_id = p.product_id
-# MAGIC   JOIN silver.customer_segments cs ON t.customer_id = cs.customer_id
+# MAGIC   JOIN silver.stores s ON t.store_sk = s.store_sk
+# MAGIC   JOIN silver.products p ON t.product_sk = p.product_sk
+# MAGIC   -- 고객 세그먼트는 갱신 주기가 더 길어 신규 고객이 아직 없을 수 있으므로, 거래가 누락되지 않도록 LEFT JOIN
+# MAGIC   LEFT JOIN silver.customer_segments cs ON t.customer_sk = cs.customer_sk
 # MAGIC GROUP BY
-# MAGIC   ALL;
+# MAGIC   t.transaction_day,
+# MAGIC   s.store_name,
+# MAGIC   s.region,
+# MAGIC   p.category,
+# MAGIC   p.product_name,
+# MAGIC   t.payment_method,
+# MAGIC   t.purchase_device,
+# MAGIC   cs.value_segment;
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- date, region 기준 리퀴드 클러스터링으로 기간/지역 필터 쿼리가 필요한 파일만 읽도록 함
+# MAGIC -- 카디널리티가 낮은 문자열 차원은 Parquet 딕셔너리 인코딩으로 저장되며, 필터에 쓰이는 차원에만 파일별 통계를 수집
+# MAGIC -- 갱신 시 재작성되는 파일이 적정 크기를 유지하도록 tuneFileSizesForRewrites 설정
+# MAGIC
+# MAGIC -- 과거 데이터(2일 이전): 매일 새벽 2시에 한 번 갱신
+# MAGIC CREATE OR REPLACE MATERIALIZED VIEW gold.retail_sales_historical
+# MAGIC CLUSTER BY (date, region)
+# MAGIC TBLPROPERTIES (
+# MAGIC   'delta.dataSkippingStatsColumns' = 'date,region,store_name,category,payment_method,device_type,cust_segment',
+# MAGIC   'delta.tuneFileSizesForRewrites' = 'true'
+# MAGIC )
+# MAGIC SCHEDULE CRON '0 0 2 * * ?'
+# MAGIC AS
+# MAGIC SELECT * FROM gold.retail_sales_base
+# MAGIC WHERE date < current_date() - INTERVAL 2 DAYS;
+# MAGIC
+# MAGIC -- 최근 데이터: 과거 MV의 마지막 일자 이후 데이터만 15분마다 갱신 (과거 MV가 비어 있으면 전체)
+# MAGIC -- 경계 일자는 실버 거래 테이블의 transaction_day 클러스터링으로 파일 단위로 걸러지므로, 갱신 시 전체 이력을 다시 읽지 않음
+# MAGIC CREATE OR REPLACE MATERIALIZED VIEW gold.retail_sales_recent
+# MAGIC CLUSTER BY (date, region)
+# MAGIC TBLPROPERTIES (
+# MAGIC   'delta.dataSkippingStatsColumns' = 'date,region,store_name,category,payment_method,device_type,cust_segment',
+# MAGIC   'delta.tuneFileSizesForRewrites' = 'true'
+# MAGIC )
+# MAGIC SCHEDULE EVERY 15 MINUTES
+# MAGIC AS
+# MAGIC SELECT * FROM gold.retail_sales_base
+# MAGIC WHERE date > COALESCE((SELECT MAX(date) FROM gold.retail_sales_historical), DATE '1900-01-01');
+# MAGIC
+# MAGIC -- 골드 테이블: 과거 데이터와 최근 데이터를 합친 뷰 (Metric View의 소스)
+# MAGIC -- 과거 MV가 먼저 갱신되고 최근 MV가 아직 갱신되기 전에는 두 MV가 겹칠 수 있으므로, 같은 경계로 최근 데이터를 한 번 더 걸러 중복을 제거
+# MAGIC CREATE OR REPLACE VIEW gold.retail_sales AS
+# MAGIC SELECT * FROM gold.retail_sales_historical
+# MAGIC UNION ALL
+# MAGIC SELECT * FROM gold.retail_sales_recent
+# MAGIC WHERE date > COALESCE((SELECT MAX(date) FROM gold.retail_sales_historical), DATE '1900-01-01');
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- 일자별 매출과 누적 매출을 미리 계산해 둔 MV
+# MAGIC -- 누적 매출 윈도우 함수를 쿼리 시점마다 전체 이력에 대해 실행하지 않도록 갱신 시 한 번만 계산
+# MAGIC CREATE OR REPLACE MATERIALIZED VIEW gold.daily_cumulative_revenue
+# MAGIC SCHEDULE EVERY 1 HOUR
+# MAGIC AS
+# MAGIC SELECT
+# MAGIC   date,
+# MAGIC   SUM(revenue) AS day_revenue,
+# MAGIC   SUM(SUM(revenue)) OVER (ORDER BY date ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS cumulative_revenue
+# MAGIC FROM gold.retail_sales
+# MAGIC GROUP BY date;
 
 # COMMAND ----------
 
 # MAGIC %md
 # MAGIC ## 3. 골드 테이블만으로의 한계
 # MAGIC
-# MAGIC 골드 테이블 `retail_sales`는 사전 집계된 데이터를 포함하고 있지만, 비즈니스 사용자에게는 다음과 같은 한계가 있습니다:
+# MAGIC 골드 테이블 `retail_sales`는 사전 집계된 데이터와 `day_of_week` 같은 일자 파생 컬럼을 포함하고 있지만, `device_type`, `cust_segment` 같은 기술적인 컬럼을 비즈니스 용어로 해석하는 방식과 지표를 계산하는 표준 방식은 정의되어 있지 않습니다. 따라서 골드 테이블을 직접 조회하는 비즈니스 사용자에게는 다음과 같은 한계가 있습니다:
 
 # COMMAND ----------
 
@@ -399,6 +592,8 @@
 # MAGIC ```
 # MAGIC
 # MAGIC 이 시맨틱 계층은 비즈니스 지표를 한 번 정의하고, 유연한 분석을 가능하게 해줍니다.
+# MAGIC
+# MAGIC 또한 `materialization` 섹션에 자주 쓰이는 차원 조합을 사전 집계로 선언할 수 있습니다. 쿼리는 필요한 차원을 모두 포함하는 가장 작은 사전 집계로 자동 라우팅되므로, 예를 들어 "일자별 매출" 쿼리는 매장 × 상품 × 세그먼트 단위의 골드 테이블 전체가 아니라 일자별 행만 읽습니다.
 
 # COMMAND ----------
 
@@ -407,13 +602,14 @@
 # MAGIC DROP VIEW IF EXISTS metrics.retail_metrics;
 # MAGIC
 # MAGIC -- 비즈니스 친화적인 차원과 지표를 포함한 Metric View 생성
-# MAGIC CREATE VIEW medemo_ykko.metrics.retail_metricstrics.retail_metrics
+# MAGIC CREATE VIEW metrics.retail_metrics
 # MAGIC WITH METRICS
 # MAGIC LANGUAGE YAML
 # MAGIC COMMENT '소매 지표 데모'
 # MAGIC AS $$
-# MAGIC version: 0.1
-# MAGIC source: select * from gold.retail_sales
+# MAGIC version: 1.1
+# MAGIC # 서브쿼리로 감싸지 않고 골드 뷰를 바로 지정하여 기간/지역 필터가 뷰를 거쳐 과거/최근 MV 스캔까지 그대로 전달되도록 함
+# MAGIC source: gold.retail_sales
 # MAGIC
 # MAGIC # 비즈니스 친화적인 차원 정의
 # MAGIC dimensions:
@@ -433,7 +629,7 @@
 # MAGIC   - name: Sales Channel
 # MAGIC     expr: CASE
 # MAGIC             WHEN device_type = 'mobile' THEN 'Mobile App'
-# MAGIC             WHEN device_type = 'web' THEN 'Website' 
+# MAGIC             WHEN device_type = 'web' THEN 'Website'
 # MAGIC             WHEN device_type = 'in-store' THEN 'In-Store'
 # MAGIC             ELSE 'Other Channel'
 # MAGIC           END
@@ -445,15 +641,12 @@
 # MAGIC             WHEN cust_segment = 'Low Value' THEN 'Occasional Shopper'
 # MAGIC             ELSE 'Unknown'
 # MAGIC           END
-# MAGIC   # 원본 데이터에 없는 파생 차원 추가
+# MAGIC   # 골드 계층에서 미리 계산한 파생 차원(요일)을 비즈니스 이름으로 노출
 # MAGIC   - name: Day of Week
-# MAGIC     expr: date_format(date, 'EEEE')
-# MAGIC   # 또 다른 유용한 파생 차원
+# MAGIC     expr: day_of_week
+# MAGIC   # 또 다른 파생 차원(주말 여부)
 # MAGIC   - name: Is Weekend
-# MAGIC     expr: CASE
-# MAGIC             WHEN date_format(date, 'E') IN ('Sat', 'Sun') THEN 'Weekend'
-# MAGIC             ELSE 'Weekday'
-# MAGIC           END
+# MAGIC     expr: is_weekend
 # MAGIC
 # MAGIC # 표준화된 비즈니스 지표 정의
 # MAGIC measures:
@@ -474,11 +667,104 @@
 # MAGIC       - order: Date
 # MAGIC         range: cumulative
 # MAGIC         semiadditive: last
+# MAGIC
+# MAGIC # 자주 쓰이는 조합을 미리 집계해 두면, 쿼리에 필요한 차원을 모두 포함하는 가장 작은 집계로 자동 라우팅됨
+# MAGIC materialization:
+# MAGIC   schedule: every 1 hour
+# MAGIC   mode: relaxed
+# MAGIC   materialized_views:
+# MAGIC     # 일자별 집계: 일별 매출 추이 등 날짜만 사용하는 쿼리용
+# MAGIC     - name: by_day
+# MAGIC       type: aggregated
+# MAGIC       dimensions:
+# MAGIC         - Date
+# MAGIC       measures:
+# MAGIC         - Orders
+# MAGIC         - Units Sold
+# MAGIC         - Revenue
+# MAGIC     # 일자 × 판매 채널 × 고객 세그먼트 집계: 채널/고객 대시보드용
+# MAGIC     - name: by_day_channel_segment
+# MAGIC       type: aggregated
+# MAGIC       dimensions:
+# MAGIC         - Date
+# MAGIC         - Sales Channel
+# MAGIC         - Customer Segment
+# MAGIC       measures:
+# MAGIC         - Orders
+# MAGIC         - Units Sold
+# MAGIC         - Revenue
 # MAGIC $$;
 # MAGIC
 
 # COMMAND ----------
 
+# MAGIC %sql
+# MAGIC -- 기존 Metric View가 존재하면 삭제
+# MAGIC DROP VIEW IF EXISTS metrics.retail_metrics_time;
+# MAGIC
+# MAGIC -- 사전 계산된 누적 매출 MV를 소스로 하는 시계열 전용 Metric View 생성
+# MAGIC -- 누적 매출은 윈도우 계산 없이, 조회 구간의 마지막 일자 값을 그대로 사용
+# MAGIC CREATE VIEW metrics.retail_metrics_time
+# MAGIC WITH METRICS
+# MAGIC LANGUAGE YAML
+# MAGIC COMMENT '소매 시계열 지표 데모 (사전 계산된 누적 매출)'
+# MAGIC AS $$
+# MAGIC version: 1.1
+# MAGIC source: gold.daily_cumulative_revenue
+# MAGIC
+# MAGIC dimensions:
+# MAGIC   - name: Date
+# MAGIC     expr: date
+# MAGIC
+# MAGIC measures:
+# MAGIC   - name: Revenue
+# MAGIC     expr: SUM(day_revenue)
+# MAGIC   - name: Cumulative Revenue
+# MAGIC     expr: MAX_BY(cumulative_revenue, date)
+# MAGIC $$;
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- 기존 Metric View가 존재하면 삭제
+# MAGIC DROP VIEW IF EXISTS metrics.retail_metrics_last_90d;
+# MAGIC
+# MAGIC -- 대시보드용 최근 90일 Metric View 생성
+# MAGIC -- filter가 모든 쿼리에 적용되므로 골드 테이블의 최근 90일 파일만 스캔하고, 누적 매출 윈도우도 90일 범위에서만 계산
+# MAGIC CREATE VIEW metrics.retail_metrics_last_90d
+# MAGIC WITH METRICS
+# MAGIC LANGUAGE YAML
+# MAGIC COMMENT '소매 지표 데모 (최근 90일 대시보드용)'
+# MAGIC AS $$
+# MAGIC version: 1.1
+# MAGIC source: gold.retail_sales
+# MAGIC filter: date >= current_date() - INTERVAL 90 DAYS
+# MAGIC
+# MAGIC dimensions:
+# MAGIC   - name: Date
+# MAGIC     expr: date
+# MAGIC   - name: Region
+# MAGIC     expr: region
+# MAGIC   - name: Category
+# MAGIC     expr: category
+# MAGIC
+# MAGIC measures:
+# MAGIC   - name: Orders
+# MAGIC     expr: SUM(transaction_count)
+# MAGIC   - name: Revenue
+# MAGIC     expr: SUM(revenue)
+# MAGIC   - name: Average Order Value
+# MAGIC     expr: SUM(revenue) / SUM(transaction_count)
+# MAGIC   - name: Cumulative Revenue
+# MAGIC     expr: SUM(revenue)
+# MAGIC     window:
+# MAGIC       - order: Date
+# MAGIC         range: cumulative
+# MAGIC         semiadditive: last
+# MAGIC $$;
+
+# COMMAND ----------
+
 # MAGIC %md
 # MAGIC ## 5. Metric Views를 활용한 비즈니스 분석
 # MAGIC
@@ -524,45 +810,32 @@
 # COMMAND ----------
 
 # MAGIC %md
-# MAGIC #### 이후: Metric View를 통한 내장된 비즈니스 용어 변환
-
-# COMMAND ----------
-
-# MAGIC %sql
-# MAGIC -- METRIC VIEW 사용 시: 깔끔하고 비즈니스 친화적인 쿼리
-# MAGIC SELECT 
-# MAGIC   `Category`,
-# MAGIC   `Sales Channel`,
-# MAGIC --  `Customer Segment`,
-# MAGIC   MEASURE(`Revenue`) AS revenue
-# MAGIC FROM metrics.retail_metrics
-# MAGIC GROUP BY ALL
-# MAGIC ORDER BY revenue DESC;
-# MAGIC
-# MAGIC -- 주요 참고 사항:
-# MAGIC -- 1. device_type이나 cust_segment에 대한 CASE 문이 더 이상 필요하지 않음
-# MAGIC -- 2. 모두가 이해할 수 있는 비즈니스 친화적인 차원 이름 사용
-# MAGIC -- 3. 변환 로직은 Metric View 정의 안에 한 번만 작성하면 됨 (모든 쿼리에서 반복하지 않음)
-# MAGIC -- 4. 모든 팀이 동일한 변환 로직을 사용하므로 일관성 확보 가능
+# MAGIC #### 이후: Metric View가 제공하는 비즈니스 용어로 조회
 
 # COMMAND ----------
 
 # MAGIC %sql
 # MAGIC -- METRIC VIEW 사용 시: 깔끔하고 비즈니스 친화적인 쿼리
+# MAGIC -- GROUPING SETS로 카테고리 × 채널, 카테고리 × 채널 × 고객 세그먼트 집계를 한 번의 스캔으로 함께 계산
+# MAGIC -- (is_subtotal = 1인 행이 카테고리 × 채널 소계이며, 각 소계 아래에 고객 세그먼트별 상세 행이 이어짐)
 # MAGIC SELECT 
 # MAGIC   `Category`,
 # MAGIC   `Sales Channel`,
-# MAGIC  `Customer Segment`,
+# MAGIC   `Customer Segment`,
+# MAGIC   GROUPING(`Customer Segment`) AS is_subtotal,
 # MAGIC   MEASURE(`Revenue`) AS revenue
 # MAGIC FROM metrics.retail_metrics
-# MAGIC GROUP BY ALL
-# MAGIC ORDER BY revenue DESC;
+# MAGIC GROUP BY GROUPING SETS (
+# MAGIC   (`Category`, `Sales Channel`),
+# MAGIC   (`Category`, `Sales Channel`, `Customer Segment`)
+# MAGIC )
+# MAGIC ORDER BY `Category`, `Sales Channel`, is_subtotal DESC, revenue DESC;
 # MAGIC
 # MAGIC -- 주요 참고 사항:
 # MAGIC -- 1. device_type이나 cust_segment에 대한 CASE 문이 더 이상 필요하지 않음
 # MAGIC -- 2. 모두가 이해할 수 있는 비즈니스 친화적인 차원 이름 사용
 # MAGIC -- 3. 변환 로직은 Metric View 정의 안에 한 번만 작성하면 됨 (모든 쿼리에서 반복하지 않음)
-# MAGIC -- 4. 모든 팀이 동일한 변환 로직을 사용하므로 일관성 확보 가능
+# MAGIC -- 4. 모든 팀이 동일한 Metric View를 사용하므로 일관성 확보 가능
 
 # COMMAND ----------
 
@@ -612,20 +885,76 @@
 # MAGIC FROM
 # MAGIC   metrics.retail_metrics
 # MAGIC GROUP BY
-# MAGIC   ALL
+# MAGIC   date
 # MAGIC ORDER BY
 # MAGIC   1 ;
 
 # COMMAND ----------
 
+# MAGIC %sql
+# MAGIC -- 대시보드처럼 반복 조회가 많다면, 누적 매출을 미리 계산해 둔 시계열 Metric View를 사용
+# MAGIC -- 쿼리 시점에는 윈도우 함수 없이 일자별 행만 읽음
+# MAGIC SELECT
+# MAGIC   `Date`,
+# MAGIC   MEASURE(`Revenue`) AS revenue,
+# MAGIC   MEASURE(`Cumulative Revenue`) AS cumulative_revenue
+# MAGIC FROM metrics.retail_metrics_time
+# MAGIC GROUP BY `Date`
+# MAGIC ORDER BY 1;
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ### 예시 3: 반복되는 대시보드 쿼리 가속
+# MAGIC
+# MAGIC 대시보드는 같은 Metric View 쿼리를 반복해서 실행합니다. 자주 조회되는 슬라이스는 두 가지 방법으로 다시 집계하지 않고 응답합니다:
+# MAGIC
+# MAGIC - **Metric View `materialization`**: `metrics.retail_metrics`에 선언한 `by_day_channel_segment` 사전 집계가 `schedule` 주기마다 갱신되며, 모든 세션과 대시보드가 이를 공유합니다. 이 `schedule`이 허용 가능한 데이터 지연 시간(TTL) 역할을 합니다.
+# MAGIC - **쿼리 결과 캐시**: SQL 웨어하우스는 동일한 쿼리를 데이터가 변경되기 전까지 캐시(`use_cached_result`, 기본값 `true`)에서 바로 반환합니다.
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- 일자 × 판매 채널 × 고객 세그먼트 슬라이스: by_day_channel_segment 사전 집계로 자동 라우팅됨
+# MAGIC SELECT
+# MAGIC   `Date`,
+# MAGIC   `Sales Channel`,
+# MAGIC   `Customer Segment`,
+# MAGIC   MEASURE(`Revenue`) AS revenue
+# MAGIC FROM metrics.retail_metrics
+# MAGIC GROUP BY `Date`, `Sales Channel`, `Customer Segment`
+# MAGIC ORDER BY `Date`;
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ### 예시 4: 최근 90일 대시보드
+# MAGIC
+# MAGIC `metrics.retail_metrics_last_90d`는 YAML의 `filter`로 최근 90일만 노출하므로, 대시보드 쿼리에 기간 조건을 따로 쓰지 않아도 골드 데이터의 최근 90일만 스캔합니다. 이 데모의 샘플 데이터는 2025년 1월 거래뿐이므로 실행 시점에 따라 아래 쿼리는 빈 결과를 반환할 수 있으며, 실제 데이터가 계속 적재되는 환경에서는 최근 90일 지표가 표시됩니다.
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- 기간 조건 없이 조회해도 filter에 의해 최근 90일 데이터만 집계됨 (샘플 데이터만 있으면 빈 결과)
+# MAGIC SELECT
+# MAGIC   `Date`,
+# MAGIC   `Region`,
+# MAGIC   MEASURE(`Revenue`) AS revenue,
+# MAGIC   MEASURE(`Cumulative Revenue`) AS cumulative_revenue
+# MAGIC FROM metrics.retail_metrics_last_90d
+# MAGIC GROUP BY `Date`, `Region`
+# MAGIC ORDER BY `Date`, `Region`;
+
+# COMMAND ----------
+
 # MAGIC %md
 # MAGIC ## 6. Unity Catalog Metric Views 도입의 주요 이점
 # MAGIC
 # MAGIC Unity Catalog Metric Views는 골드 테이블 위에 시맨틱 계층을 추가하여 다음과 같은 핵심 이점을 제공합니다:
 # MAGIC
-# MAGIC 1. **비즈니스 친화적인 용어**: 기술적인 필드명을 모두가 이해할 수 있는 비즈니스 용어로 변환
+# MAGIC 1. **비즈니스 친화적인 용어**: 기술적인 필드명 대신 모두가 이해할 수 있는 비즈니스 이름으로 차원과 지표를 제공
 # MAGIC
-# MAGIC 2. **파생 비즈니스 차원**: 원본 데이터에 존재하지 않는 "요일" 등의 유용한 차원을 생성
+# MAGIC 2. **파생 비즈니스 차원**: 골드 계층에서 미리 계산한 "요일" 등의 파생 컬럼을 일관된 비즈니스 차원으로 노출
 # MAGIC
 # MAGIC 3. **단일 진실의 원천(Single Source of Truth)**: 한 번 정의한 지표를 조직 전체에서 일관되게 사용 가능
 # MAGIC
@@ -635,7 +964,7 @@
 # MAGIC
 # MAGIC 6. **깔끔한 아키텍처**: 메달리온 아키텍처의 자연스러운 흐름을 따름 (브론즈 → 실버 → 골드 → 시맨틱)
 # MAGIC
-# MAGIC 7. **관심사의 분리**: 물리적 데이터 최적화(골드 테이블)와 비즈니스 의미 정의(Metric Views)를 분리
+# MAGIC 7. **관심사의 분리**: 물리적 데이터 최적화와 파생 컬럼 계산(골드 계층)과 비즈니스 의미 정의(Metric Views)를 분리
 
 # COMMAND ----------
 
@@ -644,7 +973,7 @@
 # MAGIC
 # MAGIC ### UC Metric Views 특징
 # MAGIC
-# MAGIC - Metric Views는 **기술 용어를 비즈니스 언어로 변환**하여 누구나 데이터를 이해하고 활용할 수 있게 해줍니다.
+# MAGIC - Metric Views는 **기술 용어 대신 비즈니스 언어로 데이터를 제공**하여 누구나 데이터를 이해하고 활용할 수 있게 해줍니다.
 # MAGIC - 지표는 **한 번만 정의**하고, 다양한 방식으로 **분석이 가능**합니다.
 # MAGIC - 비즈니스 사용자가 **기술 지식 없이도 셀프 서비스** 분석을 수행할 수 있습니다.
 # MAGIC - 메달리온 아키텍처에서 **골드 테이블 위에 자연스럽게 위치**하는 구조입니다.
@@ -661,4 +990,48 @@
 # MAGIC A: 네, `MEASURE()` 함수와 사용자 계산식을 함께 사용할 수 있습니다. 예: `MEASURE(Revenue) / MEASURE(Orders) * 100`
 # MAGIC
 # MAGIC **Q: 보안과 권한 관리는 어떻게 하나요?**  
-# MAGIC A: Metric Views는 Unity Catalog의 보안 모델과 통합되어 있습니다. 지표(Metric)에만 접근 권한을 부여하고, 기반 테이블에 대한 접근은 제한할 수 있습니다.
+# MAGIC A: Metric Views는 Unity Catalog의 보안 모델과 통합되어 있습니다. 지표(Metric)에만 접근 권한을 부여하고, 기반 테이블에 대한 접근은 제한할 수 있습니다. 아래 예시를 참고하세요.
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 8. 권한 설정: Metric View만 공개하기
+# MAGIC
+# MAGIC BI 사용자에게는 `metrics` 스키마의 Metric View에 대한 조회 권한만 부여하고, 브론즈/실버/골드 테이블에 대한 접근은 제한합니다. 사용자가 Metric View로 필요한 차원 조합을 직접 조회할 수 있으므로, 팀별로 별도의 집계 테이블을 만들어 유지할 필요가 없습니다. 물리적으로 저장하는 데이터는 갱신 비용이 큰 집계 MV(골드 과거/최근 MV, 고객별 누적 금액, 일자별 누적 매출)로 한정하고, `silver.customer_segments`나 `gold.retail_sales`처럼 가벼운 변환은 일반 뷰로 유지합니다.
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- BI 사용자 그룹에는 Metric View 조회 권한만 부여
+# MAGIC -- 브론즈/실버/골드 스키마에는 권한을 부여하지 않으므로, 기반 테이블은 Metric View를 통해서만 조회 가능
+# MAGIC -- 아래 예시의 bi_users를 작업 공간에 실제로 존재하는 그룹 이름으로 바꾼 뒤 주석을 해제하여 실행하세요
+# MAGIC -- GRANT USE CATALOG ON CATALOG demo_ykko TO `bi_users`;
+# MAGIC -- GRANT USE SCHEMA ON SCHEMA metrics TO `bi_users`;
+# MAGIC -- GRANT SELECT ON SCHEMA metrics TO `bi_users`;
+# MAGIC
+# MAGIC -- 현재 metrics 스키마에 부여된 권한 확인
+# MAGIC SHOW GRANTS ON SCHEMA metrics;
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 9. 데모 정리: 예약된 갱신 중지
+# MAGIC
+# MAGIC 이 노트북은 실버 스트리밍 테이블과 MV, Metric View `materialization`에 갱신 스케줄을 설정하므로, 데모가 끝난 뒤에도 서버리스 컴퓨팅이 계속 사용됩니다. 데모를 마친 후 아래 셀을 실행하여 스케줄을 해제하세요. 노트북을 다시 실행하면 스케줄이 다시 설정됩니다.
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- 실버 스트리밍 테이블의 15분 주기 갱신 해제
+# MAGIC ALTER STREAMING TABLE silver.transactions DROP SCHEDULE;
+# MAGIC ALTER STREAMING TABLE silver.products DROP SCHEDULE;
+# MAGIC ALTER STREAMING TABLE silver.stores DROP SCHEDULE;
+# MAGIC
+# MAGIC -- MV 갱신 스케줄 해제
+# MAGIC ALTER MATERIALIZED VIEW silver.customer_totals DROP SCHEDULE;
+# MAGIC ALTER MATERIALIZED VIEW gold.retail_sales_historical DROP SCHEDULE;
+# MAGIC ALTER MATERIALIZED VIEW gold.retail_sales_recent DROP SCHEDULE;
+# MAGIC ALTER MATERIALIZED VIEW gold.daily_cumulative_revenue DROP SCHEDULE;
+# MAGIC
+# MAGIC -- Metric View의 materialization 갱신은 뷰와 함께 관리되므로, 뷰를 삭제하여 중지 (4단계를 다시 실행하면 재생성)
+# MAGIC DROP VIEW IF EXISTS metrics.retail_metrics;